@@ -5,6 +5,13 @@ Run: uv run python main.py
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import platform
+import sys
+from collections.abc import AsyncIterator
+
+import anyio
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,15 +21,18 @@ from chatkit.server import NonStreamingResult, StreamingResult
 from memory_store import InMemoryStore, RequestContext
 from server_impl import MockChatKitServer
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="chatkit-ui dev server")
 
-# CORS for local development
+# CORS for local development. Wildcards are resolved to flags when the
+# middleware is built, so "*" origins/headers take its fast path per request.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=("*",),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=("GET", "POST"),
+    allow_headers=("*",),
 )
 
 # Create server with in-memory store
@@ -30,6 +40,72 @@ store = InMemoryStore()
 server = MockChatKitServer(store=store)
 
 
+_MAX_BODY_PREALLOC = 1 << 20
+
+
+async def _read_body(request: Request) -> bytes | bytearray:
+    """Read the request body into a buffer preallocated from Content-Length.
+
+    The header is client-controlled, so at most `_MAX_BODY_PREALLOC` bytes are
+    reserved up front; larger bodies grow the buffer as chunks arrive.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is None or not content_length.isdigit():
+        return await request.body()
+
+    buf = bytearray(min(int(content_length), _MAX_BODY_PREALLOC))
+    offset = 0
+    async for chunk in request.stream():
+        end = offset + len(chunk)
+        buf[offset:end] = chunk
+        offset = end
+    # Trim if the client sent less than it declared
+    del buf[offset:]
+    return buf
+
+
+async def _buffered(
+    source: AsyncIterator[bytes], maxsize: int = 32
+) -> AsyncIterator[bytes]:
+    """Relay frames through a bounded queue filled by a separate task.
+
+    The producer may run up to `maxsize` frames ahead of a slow client
+    instead of stalling on every socket write. Producer errors are re-raised
+    here. If the client goes away, the producer is cancelled and awaited in
+    a shielded scope, so chatkit's cancellation handling finishes within the
+    request even though Starlette is cancelling this generator.
+    """
+    queue: asyncio.Queue[bytes | BaseException | None] = asyncio.Queue(maxsize)
+    closing = False
+
+    async def produce() -> None:
+        try:
+            async for frame in source:
+                await queue.put(frame)
+        except BaseException as exc:
+            # Once the consumer is closing nobody reads the queue, so let
+            # cancellation (and errors from its handling) end the task
+            if closing or isinstance(exc, asyncio.CancelledError):
+                raise
+            await queue.put(exc)
+        else:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (frame := await queue.get()) is not None:
+            if isinstance(frame, BaseException):
+                raise frame
+            yield frame
+    finally:
+        closing = True
+        producer.cancel()
+        with anyio.CancelScope(shield=True):
+            (outcome,) = await asyncio.gather(producer, return_exceptions=True)
+        if not isinstance(outcome, asyncio.CancelledError | None):
+            logger.error("Stream producer failed during cleanup", exc_info=outcome)
+
+
 @app.post("/chatkit")
 async def chatkit_endpoint(request: Request) -> Response:
     """Single ChatKit protocol endpoint.
@@ -37,15 +113,18 @@ async def chatkit_endpoint(request: Request) -> Response:
     Receives JSON with a `type` discriminator field and routes to
     streaming (SSE) or non-streaming (JSON) handlers.
     """
-    body = await request.body()
-    print(f"[chatkit] received {len(body)} bytes")
+    body = await _read_body(request)
+    logger.debug("[chatkit] received %d bytes", len(body))
 
     context = RequestContext()
     result = await server.process(body, context)
 
     if isinstance(result, StreamingResult):
+        # chatkit already yields SSE frames as bytes (pydantic-core JSON), so
+        # buffer its generator directly rather than the re-yielding
+        # StreamingResult wrapper.
         return StreamingResponse(
-            result,
+            _buffered(result.json_events),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -61,7 +140,7 @@ async def chatkit_endpoint(request: Request) -> Response:
 
 
 @app.get("/health")
-async def health():
+async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
@@ -81,4 +160,17 @@ if __name__ == "__main__":
     print("  'slow'         — 500ms delays between chunks")
     print("  'annotations'  — Response with source annotations")
     print()
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools ship with uvicorn[standard]. Request them explicitly
+    # so a broken install fails loudly, except where uvicorn's install marker
+    # leaves uvloop out (Windows, Cygwin, PyPy).
+    uvloop_supported = (
+        sys.platform not in ("win32", "cygwin")
+        and platform.python_implementation() != "PyPy"
+    )
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if uvloop_supported else "asyncio",
+        http="httptools",
+    )
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections import OrderedDict
+from itertools import islice
 from typing import Any
 
 from chatkit.store import NotFoundError, Store
@@ -14,6 +14,22 @@ from chatkit.types import (
 )
 
 
+def _seek(
+    index: dict[str, int], after: str | None, size: int, order: str
+) -> int:
+    """Return the offset of the first entry following the `after` cursor.
+
+    Offsets count entries in `order`; an unknown cursor yields an empty
+    page, matching the previous linear scan.
+    """
+    if after is None:
+        return 0
+    position = index.get(after)
+    if position is None:
+        return size
+    return size - position if order == "desc" else position + 1
+
+
 class RequestContext:
     """Simple request context — single-user dev server."""
 
@@ -25,9 +41,13 @@ class InMemoryStore(Store[RequestContext]):
 
     def __init__(self) -> None:
         # thread_id → ThreadMetadata
-        self._threads: OrderedDict[str, ThreadMetadata] = OrderedDict()
-        # thread_id → OrderedDict[item_id → ThreadItem]
-        self._items: dict[str, OrderedDict[str, ThreadItem]] = {}
+        self._threads: dict[str, ThreadMetadata] = {}
+        # thread_id → insertion position in _threads
+        self._thread_index: dict[str, int] = {}
+        # thread_id → {item_id → ThreadItem}, in insertion order
+        self._items: dict[str, dict[str, ThreadItem]] = {}
+        # thread_id → item_id → insertion position in _items[thread_id]
+        self._item_index: dict[str, dict[str, int]] = {}
         # attachment_id → Attachment
         self._attachments: dict[str, Attachment] = {}
 
@@ -42,9 +62,11 @@ class InMemoryStore(Store[RequestContext]):
     async def save_thread(
         self, thread: ThreadMetadata, context: RequestContext
     ) -> None:
+        if thread.id not in self._thread_index:
+            self._thread_index[thread.id] = len(self._threads)
         self._threads[thread.id] = thread
-        if thread.id not in self._items:
-            self._items[thread.id] = OrderedDict()
+        self._items.setdefault(thread.id, {})
+        self._item_index.setdefault(thread.id, {})
 
     async def load_thread_items(
         self,
@@ -54,25 +76,20 @@ class InMemoryStore(Store[RequestContext]):
         order: str,
         context: RequestContext,
     ) -> Page[ThreadItem]:
-        thread_items = self._items.get(thread_id, OrderedDict())
-        items_list = list(thread_items.values())
-
+        thread_items = self._items.get(thread_id, {})
+        values = thread_items.values()
         if order == "desc":
-            items_list = list(reversed(items_list))
-
-        # Apply cursor-based pagination
-        if after is not None:
-            found = False
-            filtered = []
-            for item in items_list:
-                if found:
-                    filtered.append(item)
-                if item.id == after:
-                    found = True
-            items_list = filtered
-
-        has_more = len(items_list) > limit
-        result = items_list[:limit]
+            values = reversed(values)
+
+        # Keyset pagination: seek to the cursor by id, then pull one page
+        # (plus one to detect has_more) without copying the whole thread
+        start = _seek(
+            self._item_index.get(thread_id, {}), after, len(thread_items), order
+        )
+        page = list(islice(values, start, start + limit + 1))
+
+        has_more = len(page) > limit
+        result = page[:limit]
         next_after = result[-1].id if has_more and result else None
 
         return Page[ThreadItem](data=result, has_more=has_more, after=next_after)
@@ -102,23 +119,15 @@ class InMemoryStore(Store[RequestContext]):
         order: str,
         context: RequestContext,
     ) -> Page[ThreadMetadata]:
-        threads_list = list(self._threads.values())
-
+        values = self._threads.values()
         if order == "desc":
-            threads_list = list(reversed(threads_list))
-
-        if after is not None:
-            found = False
-            filtered = []
-            for thread in threads_list:
-                if found:
-                    filtered.append(thread)
-                if thread.id == after:
-                    found = True
-            threads_list = filtered
-
-        has_more = len(threads_list) > limit
-        result = threads_list[:limit]
+            values = reversed(values)
+
+        start = _seek(self._thread_index, after, len(self._threads), order)
+        page = list(islice(values, start, start + limit + 1))
+
+        has_more = len(page) > limit
+        result = page[:limit]
         next_after = result[-1].id if has_more and result else None
 
         return Page[ThreadMetadata](data=result, has_more=has_more, after=next_after)
@@ -126,16 +135,17 @@ class InMemoryStore(Store[RequestContext]):
     async def add_thread_item(
         self, thread_id: str, item: ThreadItem, context: RequestContext
     ) -> None:
-        if thread_id not in self._items:
-            self._items[thread_id] = OrderedDict()
-        self._items[thread_id][item.id] = item
+        # setdefault fetches or creates each per-thread dict in one lookup
+        thread_items = self._items.setdefault(thread_id, {})
+        index = self._item_index.setdefault(thread_id, {})
+        if item.id not in index:
+            index[item.id] = len(index)
+        thread_items[item.id] = item
 
     async def save_item(
         self, thread_id: str, item: ThreadItem, context: RequestContext
     ) -> None:
-        if thread_id not in self._items:
-            self._items[thread_id] = OrderedDict()
-        self._items[thread_id][item.id] = item
+        await self.add_thread_item(thread_id, item, context)
 
     async def load_item(
         self, thread_id: str, item_id: str, context: RequestContext
@@ -149,11 +159,17 @@ class InMemoryStore(Store[RequestContext]):
     async def delete_thread(
         self, thread_id: str, context: RequestContext
     ) -> None:
-        self._threads.pop(thread_id, None)
+        if self._threads.pop(thread_id, None) is not None:
+            self._thread_index = {tid: i for i, tid in enumerate(self._threads)}
         self._items.pop(thread_id, None)
+        self._item_index.pop(thread_id, None)
 
     async def delete_thread_item(
         self, thread_id: str, item_id: str, context: RequestContext
     ) -> None:
         thread_items = self._items.get(thread_id, {})
-        thread_items.pop(item_id, None)
+        if thread_items.pop(item_id, None) is not None:
+            # Positions after the removed item shift down; reindex the thread
+            self._item_index[thread_id] = {
+                iid: i for i, iid in enumerate(thread_items)
+            }
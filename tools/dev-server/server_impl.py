@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
@@ -53,6 +54,11 @@ from chatkit.widgets import (
 
 from memory_store import InMemoryStore, RequestContext
 
+logger = logging.getLogger(__name__)
+
+# Bound once to skip the global + attribute lookup at each timestamp
+_now = datetime.now
+
 LOREM_PARAGRAPHS = [
     "This is a test response from the chatkit-ui dev server. "
     "The server echoes your message and streams back a multi-paragraph response "
@@ -73,21 +79,82 @@ LONG_PARAGRAPHS = [
     for i in range(17)
 ]
 
+STREAM_CHUNK_SIZE = 12
+# Fast streams coalesce chunks into deltas of at least this many characters
+STREAM_FLUSH_SIZE = 64
+
+# Scenario texts are constant, so join and chunk them once at import
+LOREM_TEXT = "\n\n".join(LOREM_PARAGRAPHS)
+LONG_TEXT = "\n\n".join(LONG_PARAGRAPHS)
+
+
+def _chunk_text(text: str, chunk_size: int) -> list[str]:
+    """Split text into the deltas streamed by `_stream_text`."""
+    return [text[i : i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+LONG_TEXT_CHUNKS = _chunk_text(LONG_TEXT, STREAM_CHUNK_SIZE)
+
+# Workflow scenario tasks never change, so they are built once and shared.
+# Only the task lists are mutated (chatkit applies task updates in place),
+# so each workflow gets its own list.
+WORKFLOW_ANALYZE_TASK = CustomTask(
+    title="Analyzing request",
+    icon="sparkle",
+    status_indicator="loading",
+)
+WORKFLOW_SEARCH_TASK = SearchTask(
+    title="Searching the web",
+    title_query="chatkit protocol",
+    queries=["chatkit wire protocol", "chatkit-python SSE"],
+    status_indicator="loading",
+    sources=[
+        URLSource(
+            title="ChatKit Python Docs",
+            url="https://openai.github.io/chatkit-python/",
+            attribution="OpenAI",
+        ),
+    ],
+)
+WORKFLOW_THOUGHT_TASK = ThoughtTask(
+    title="Synthesizing results",
+    content="Combining search results with user context...",
+    status_indicator="loading",
+)
+WORKFLOW_FINAL_TASKS = tuple(
+    task.model_copy(update={"status_indicator": "complete"})
+    for task in (WORKFLOW_ANALYZE_TASK, WORKFLOW_SEARCH_TASK, WORKFLOW_THOUGHT_TASK)
+)
+
 
 def _extract_user_text(user_message: UserMessageItem | None) -> str:
     """Extract plain text from user message content."""
     if user_message is None:
         return ""
-    parts = []
-    for content in user_message.content:
-        if hasattr(content, "text"):
-            parts.append(content.text)
+    parts = [
+        text
+        for content in user_message.content
+        if (text := getattr(content, "text", None)) is not None
+    ]
     return " ".join(parts).lower().strip()
 
 
 class MockChatKitServer(ChatKitServer[RequestContext]):
     """Dev server with keyword-triggered mock responses."""
 
+    # (keyword, scenario method) pairs; the first keyword found in the
+    # user's text wins, falling back to `_scenario_default`.
+    _SCENARIOS: tuple[tuple[str, str], ...] = (
+        ("error", "_scenario_error"),
+        ("widget", "_scenario_widget"),
+        ("tool", "_scenario_tool"),
+        ("workflow", "_scenario_workflow"),
+        ("notice", "_scenario_notice"),
+        ("slow", "_scenario_slow"),
+        ("long", "_scenario_long"),
+        ("annotations", "_scenario_annotations"),
+    )
+
     def __init__(self, store: InMemoryStore) -> None:
         super().__init__(store=store)
 
@@ -98,35 +165,19 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         context: RequestContext,
     ) -> AsyncIterator[ThreadStreamEvent]:
         user_text = _extract_user_text(input_user_message)
-        print(f"  [respond] user_text={user_text!r}")
-
-        if "error" in user_text:
-            async for event in self._scenario_error(thread, context):
-                yield event
-        elif "widget" in user_text:
-            async for event in self._scenario_widget(thread, context):
-                yield event
-        elif "tool" in user_text:
-            async for event in self._scenario_tool(thread, context):
-                yield event
-        elif "workflow" in user_text:
-            async for event in self._scenario_workflow(thread, context):
-                yield event
-        elif "notice" in user_text:
-            async for event in self._scenario_notice(thread, context):
-                yield event
-        elif "slow" in user_text:
-            async for event in self._scenario_slow(thread, user_text, context):
-                yield event
-        elif "long" in user_text:
-            async for event in self._scenario_long(thread, context):
-                yield event
-        elif "annotations" in user_text:
-            async for event in self._scenario_annotations(thread, context):
-                yield event
+        logger.debug("[respond] user_text=%r", user_text)
+
+        for keyword, name in self._SCENARIOS:
+            if keyword in user_text:
+                scenario = getattr(self, name)
+                break
         else:
-            async for event in self._scenario_default(thread, user_text, context):
-                yield event
+            scenario = self._scenario_default
+
+        # One timestamp is shared by every item created in this response
+        now = _now()
+        async for event in scenario(thread, user_text, context, now):
+            yield event
 
     async def add_feedback(
         self,
@@ -135,7 +186,9 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         feedback: FeedbackKind,
         context: RequestContext,
     ) -> None:
-        print(f"  [feedback] thread={thread_id} items={item_ids} kind={feedback}")
+        logger.debug(
+            "[feedback] thread=%s items=%s kind=%s", thread_id, item_ids, feedback
+        )
 
     def action(
         self,
@@ -153,7 +206,7 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         sender: WidgetItem | None,
         context: RequestContext,
     ) -> AsyncIterator[ThreadStreamEvent]:
-        print(f"  [action] type={action.type} payload={action.payload}")
+        logger.debug("[action] type=%s payload=%s", action.type, action.payload)
         # Echo the action back as an assistant message
         text = f"Received action: type=`{action.type}`, payload=`{action.payload}`"
         async for event in self._stream_text(thread, text, context):
@@ -166,17 +219,20 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         thread: ThreadMetadata,
         user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Echo user message + stream lorem paragraphs."""
         echo = f"You said: *{user_text}*\n\n" if user_text else ""
-        full_text = echo + "\n\n".join(LOREM_PARAGRAPHS)
-        async for event in self._stream_text(thread, full_text, context):
+        full_text = echo + LOREM_TEXT
+        async for event in self._stream_text(thread, full_text, context, now=now):
             yield event
 
     async def _scenario_error(
         self,
         thread: ThreadMetadata,
+        user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Yield an error event."""
         raise CustomStreamError(
@@ -188,7 +244,9 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
     async def _scenario_widget(
         self,
         thread: ThreadMetadata,
+        user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Respond with a Card widget containing form elements."""
         item_id = default_generate_id("message")
@@ -210,7 +268,7 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
             item=WidgetItem(
                 id=item_id,
                 thread_id=thread.id,
-                created_at=datetime.now(),
+                created_at=now,
                 widget=widget,
                 copy_text="Test widget form",
             ),
@@ -219,14 +277,16 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
     async def _scenario_tool(
         self,
         thread: ThreadMetadata,
+        user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Yield a client tool call."""
         item_id = default_generate_id("tool_call")
         tool_item = ClientToolCallItem(
             id=item_id,
             thread_id=thread.id,
-            created_at=datetime.now(),
+            created_at=now,
             status="pending",
             call_id=f"call_{item_id}",
             name="get_weather",
@@ -237,24 +297,18 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
     async def _scenario_workflow(
         self,
         thread: ThreadMetadata,
+        user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Yield a workflow with multiple tasks that update over time."""
         item_id = default_generate_id("workflow")
-        workflow = Workflow(
-            type="custom",
-            tasks=[
-                CustomTask(
-                    title="Analyzing request",
-                    icon="sparkle",
-                    status_indicator="loading",
-                ),
-            ],
-        )
+        analyze_done, search_done, thought_done = WORKFLOW_FINAL_TASKS
+        workflow = Workflow(type="custom", tasks=[WORKFLOW_ANALYZE_TASK])
         workflow_item = WorkflowItem(
             id=item_id,
             thread_id=thread.id,
-            created_at=datetime.now(),
+            created_at=now,
             workflow=workflow,
         )
         yield ThreadItemAddedEvent(item=workflow_item)
@@ -264,33 +318,11 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         # Complete first task, add second
         yield ThreadItemUpdatedEvent(
             item_id=item_id,
-            update=WorkflowTaskUpdated(
-                task_index=0,
-                task=CustomTask(
-                    title="Analyzing request",
-                    icon="sparkle",
-                    status_indicator="complete",
-                ),
-            ),
+            update=WorkflowTaskUpdated(task_index=0, task=analyze_done),
         )
         yield ThreadItemUpdatedEvent(
             item_id=item_id,
-            update=WorkflowTaskAdded(
-                task_index=1,
-                task=SearchTask(
-                    title="Searching the web",
-                    title_query="chatkit protocol",
-                    queries=["chatkit wire protocol", "chatkit-python SSE"],
-                    status_indicator="loading",
-                    sources=[
-                        URLSource(
-                            title="ChatKit Python Docs",
-                            url="https://openai.github.io/chatkit-python/",
-                            attribution="OpenAI",
-                        ),
-                    ],
-                ),
-            ),
+            update=WorkflowTaskAdded(task_index=1, task=WORKFLOW_SEARCH_TASK),
         )
 
         await asyncio.sleep(0.8)
@@ -298,71 +330,22 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         # Complete second task, add third
         yield ThreadItemUpdatedEvent(
             item_id=item_id,
-            update=WorkflowTaskUpdated(
-                task_index=1,
-                task=SearchTask(
-                    title="Searching the web",
-                    title_query="chatkit protocol",
-                    queries=["chatkit wire protocol", "chatkit-python SSE"],
-                    status_indicator="complete",
-                    sources=[
-                        URLSource(
-                            title="ChatKit Python Docs",
-                            url="https://openai.github.io/chatkit-python/",
-                            attribution="OpenAI",
-                        ),
-                    ],
-                ),
-            ),
+            update=WorkflowTaskUpdated(task_index=1, task=search_done),
         )
         yield ThreadItemUpdatedEvent(
             item_id=item_id,
-            update=WorkflowTaskAdded(
-                task_index=2,
-                task=ThoughtTask(
-                    title="Synthesizing results",
-                    content="Combining search results with user context...",
-                    status_indicator="loading",
-                ),
-            ),
+            update=WorkflowTaskAdded(task_index=2, task=WORKFLOW_THOUGHT_TASK),
         )
 
         await asyncio.sleep(0.5)
 
         yield ThreadItemUpdatedEvent(
             item_id=item_id,
-            update=WorkflowTaskUpdated(
-                task_index=2,
-                task=ThoughtTask(
-                    title="Synthesizing results",
-                    content="Combining search results with user context...",
-                    status_indicator="complete",
-                ),
-            ),
+            update=WorkflowTaskUpdated(task_index=2, task=thought_done),
         )
 
         # Finalize workflow
-        workflow_item.workflow.tasks = [
-            CustomTask(title="Analyzing request", icon="sparkle", status_indicator="complete"),
-            SearchTask(
-                title="Searching the web",
-                title_query="chatkit protocol",
-                queries=["chatkit wire protocol", "chatkit-python SSE"],
-                status_indicator="complete",
-                sources=[
-                    URLSource(
-                        title="ChatKit Python Docs",
-                        url="https://openai.github.io/chatkit-python/",
-                        attribution="OpenAI",
-                    ),
-                ],
-            ),
-            ThoughtTask(
-                title="Synthesizing results",
-                content="Combining search results with user context...",
-                status_indicator="complete",
-            ),
-        ]
+        workflow_item.workflow.tasks = list(WORKFLOW_FINAL_TASKS)
         yield ThreadItemDoneEvent(item=workflow_item)
 
         # Follow up with a text response
@@ -371,13 +354,16 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
             "The workflow completed successfully with 3 tasks: "
             "analysis, web search, and synthesis.",
             context,
+            now=now,
         ):
             yield event
 
     async def _scenario_notice(
         self,
         thread: ThreadMetadata,
+        user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Yield notice events followed by a normal response."""
         yield NoticeEvent(
@@ -394,6 +380,7 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
             thread,
             "Two notices were sent before this response (info and warning).",
             context,
+            now=now,
         ):
             yield event
 
@@ -402,6 +389,7 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         thread: ThreadMetadata,
         user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Stream with 500ms delays between chunks."""
         async for event in self._stream_text(
@@ -410,23 +398,29 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
             "Each chunk takes 500ms to arrive.",
             context,
             chunk_delay=0.5,
+            now=now,
         ):
             yield event
 
     async def _scenario_long(
         self,
         thread: ThreadMetadata,
+        user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Stream a very long response for scroll/performance testing."""
-        full_text = "\n\n".join(LONG_PARAGRAPHS)
-        async for event in self._stream_text(thread, full_text, context):
+        async for event in self._stream_text(
+            thread, LONG_TEXT, context, chunks=LONG_TEXT_CHUNKS, now=now
+        ):
             yield event
 
     async def _scenario_annotations(
         self,
         thread: ThreadMetadata,
+        user_text: str,
         context: RequestContext,
+        now: datetime,
     ) -> AsyncIterator[ThreadStreamEvent]:
         """Stream a response with source annotations."""
         item_id = default_generate_id("message")
@@ -464,7 +458,7 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         item = AssistantMessageItem(
             id=item_id,
             thread_id=thread.id,
-            created_at=datetime.now(),
+            created_at=now,
             content=[content],
         )
         yield ThreadItemDoneEvent(item=item)
@@ -477,16 +471,30 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         full_text: str,
         context: RequestContext,
         chunk_delay: float = 0.03,
-        chunk_size: int = 12,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        chunks: list[str] | None = None,
+        min_flush_size: int | None = None,
+        now: datetime | None = None,
     ) -> AsyncIterator[ThreadStreamEvent]:
-        """Stream text as an assistant message with realistic deltas."""
+        """Stream text as an assistant message with realistic deltas.
+
+        `chunks` may carry a precomputed split of `full_text` (see
+        `LONG_TEXT_CHUNKS`); otherwise the text is split by `chunk_size`.
+        Consecutive chunks are batched into one delta of at least
+        `min_flush_size` characters, sleeping `chunk_delay` per chunk so
+        the overall pace is unchanged. It defaults to `STREAM_FLUSH_SIZE`
+        when `chunk_delay` is under 50ms and to no batching otherwise.
+        Both created items are stamped with `now` (default: the current time).
+        """
         item_id = default_generate_id("message")
+        if now is None:
+            now = _now()
 
         # Create empty assistant message
         item = AssistantMessageItem(
             id=item_id,
             thread_id=thread.id,
-            created_at=datetime.now(),
+            created_at=now,
             content=[],
         )
         yield ThreadItemAddedEvent(item=item)
@@ -501,18 +509,30 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
         )
 
         # Stream text deltas
-        offset = 0
-        while offset < len(full_text):
-            chunk = full_text[offset : offset + chunk_size]
-            yield ThreadItemUpdatedEvent(
+        if chunks is None:
+            chunks = _chunk_text(full_text, chunk_size)
+        if min_flush_size is None:
+            min_flush_size = STREAM_FLUSH_SIZE if chunk_delay < 0.05 else 0
+        # Bound locally since they are constructed once per delta. Plain
+        # validated construction is kept: pydantic-core's validator is
+        # faster here than model_construct's Python-side field handling.
+        make_event = ThreadItemUpdatedEvent
+        make_delta = AssistantMessageContentPartTextDelta
+        pending: list[str] = []
+        pending_size = 0
+        last = len(chunks)
+        for i, chunk in enumerate(chunks, 1):
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size < min_flush_size and i < last:
+                continue
+            yield make_event(
                 item_id=item_id,
-                update=AssistantMessageContentPartTextDelta(
-                    content_index=0,
-                    delta=chunk,
-                ),
+                update=make_delta(content_index=0, delta="".join(pending)),
             )
-            offset += chunk_size
-            await asyncio.sleep(chunk_delay)
+            await asyncio.sleep(chunk_delay * len(pending))
+            pending.clear()
+            pending_size = 0
 
         # Finalize content part
         yield ThreadItemUpdatedEvent(
@@ -533,6 +553,6 @@ class MockChatKitServer(ChatKitServer[RequestContext]):
             item=EndOfTurnItem(
                 id=eot_id,
                 thread_id=thread.id,
-                created_at=datetime.now(),
+                created_at=now,
             ),
         )